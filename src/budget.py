@@ -0,0 +1,178 @@
+import math
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable
+
+from dominate.tags import div, p
+from dominate.util import raw
+from pydantic import BaseModel, Field
+
+DEFAULT_CACHE_DIR = Path(".cache")
+
+# Budget misses and failures per module over the lifetime of the process (e.g. across scheduled prints)
+MISS_COUNTS: Counter[str] = Counter()
+FAILURE_COUNTS: Counter[str] = Counter()
+
+
+class BudgetReport(BaseModel):
+    """
+    Model representing the latency of a single receipt.
+
+    Attributes
+    ----------
+    elapsed : float
+        Seconds spent generating all module content.
+    fallbacks : dict[str, str]
+        Modules that did not deliver in time (or failed), mapped to a description of the fallback used.
+    """
+
+    elapsed: float = 0.0
+    fallbacks: dict[str, str] = Field(default_factory=dict)
+
+    def summary(self) -> str:
+        """
+        Formats the report for printing.
+
+        Returns
+        -------
+        str
+            A one-line summary, followed by one line per fallback.
+        """
+        lines = [f"Generated content in {self.elapsed:.2f}s ({len(self.fallbacks)} fallback(s))"]
+        for name, reason in self.fallbacks.items():
+            lines.append(f"  {name}: {reason}")
+        return "\n".join(lines)
+
+
+def parse_budgets(values: list[str]) -> dict[str, float]:
+    """
+    Parses a list of "name=seconds" strings into per-module budgets.
+
+    Parameters
+    ----------
+    values : list[str]
+        The budgets, e.g. ["weather=3", "sudoku=1.5"].
+
+    Returns
+    -------
+    dict[str, float]
+        The budget in seconds for each named module.
+
+    Raises
+    ------
+    ValueError
+        If a value is not of the form "name=seconds" with a positive, finite number of seconds.
+    """
+    budgets = {}
+    for value in values:
+        name, _, seconds = value.partition("=")
+        try:
+            budget = float(seconds)
+        except ValueError:
+            budget = 0.0
+        if not name or not math.isfinite(budget) or budget <= 0:
+            raise ValueError(f"Invalid budget {value!r} (expected name=seconds)")
+        budgets[name] = budget
+    return budgets
+
+
+def fallback(name: str, cache_dir: Path = DEFAULT_CACHE_DIR) -> tuple[div, str]:
+    """
+    Builds replacement content for a module, preferring its last good render.
+
+    Parameters
+    ----------
+    name : str
+        The module name.
+    cache_dir : Path
+        Directory holding the last good render of each module.
+
+    Returns
+    -------
+    tuple[div, str]
+        The replacement content and a description of which fallback was used.
+    """
+    cached = cache_dir / f"{name}.html"
+    if cached.exists():
+        return div(raw(cached.read_text())), "used cached render"
+    return div(p(f"{name.capitalize()} unavailable"), cls="text-center"), "used placeholder"
+
+
+def _save(name: str, content: div, cache_dir: Path) -> None:
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        (cache_dir / f"{name}.html").write_text(str(content))
+    except OSError as e:
+        print(f"Could not cache {name} render: {e}")
+
+
+def generate_within_budget(
+    modules: list[tuple[str, Callable[[], div]]],
+    budgets: dict[str, float],
+    slo: float,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+) -> tuple[list[div], BudgetReport]:
+    """
+    Generates the content of each module concurrently, bounding the total latency.
+
+    Each module must deliver within its own budget and within the job-wide SLO,
+    whichever ends first. A module that misses its deadline or fails is replaced
+    with its last good render, or a placeholder if it has never rendered.
+
+    A late module is not interrupted, so generators must bound their own I/O
+    (as get_weather does with a request timeout).
+
+    Parameters
+    ----------
+    modules : list[tuple[str, Callable[[], div]]]
+        The module names and their content generators, in print order.
+    budgets : dict[str, float]
+        The budget in seconds for each module. Modules without one only get the SLO.
+    slo : float
+        The budget in seconds for the whole job.
+    cache_dir : Path
+        Directory holding the last good render of each module.
+
+    Returns
+    -------
+    tuple[list[div], BudgetReport]
+        The content of each module, in order, and the latency report.
+    """
+    report = BudgetReport()
+    contents = []
+    start = time.monotonic()
+    job_deadline = start + slo
+    # Late modules are not waited for here, but concurrent.futures still joins its
+    # worker threads at interpreter exit, so a hung generator delays process exit
+    executor = ThreadPoolExecutor(max_workers=max(len(modules), 1))
+    try:
+        futures = [executor.submit(generate) for _, generate in modules]
+        for (name, _), future in zip(modules, futures):
+            deadline = min(start + budgets.get(name, slo), job_deadline)
+            # Only the wait is bounded by the budget; a TimeoutError raised by the
+            # generator itself is a failure, not a budget miss
+            wait([future], timeout=max(deadline - time.monotonic(), 0))
+            if not future.done():
+                MISS_COUNTS[name] += 1
+                content, used = fallback(name, cache_dir)
+                report.fallbacks[name] = (
+                    f"missed {deadline - start:.2f}s budget, {used} (misses so far: {MISS_COUNTS[name]})"
+                )
+            else:
+                try:
+                    content = future.result()
+                except Exception as e:
+                    FAILURE_COUNTS[name] += 1
+                    content, used = fallback(name, cache_dir)
+                    report.fallbacks[name] = (
+                        f"failed ({e}), {used} (failures so far: {FAILURE_COUNTS[name]})"
+                    )
+                else:
+                    _save(name, content, cache_dir)
+            contents.append(content)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    report.elapsed = time.monotonic() - start
+    return contents, report
@@ -0,0 +1,307 @@
+import time
+from collections import deque
+from pathlib import Path
+
+from escpos.escpos import Escpos
+from PIL import Image
+
+ESC = 0x1B
+GS = 0x1D
+LF = 0x0A
+
+# Default line spacing (ESC 2) in dots
+DEFAULT_LINE_SPACING = 30
+
+# Mode commands taking a single parameter byte (alignment, text style, code page, ...).
+# They are accepted so that jobs using them decode, but do not change the decoded pages.
+MODE_COMMANDS = {
+    b"\x1b!", b"\x1b-", b"\x1bE", b"\x1bG", b"\x1bM", b"\x1bR", b"\x1bV", b"\x1ba", b"\x1bt", b"\x1b{",
+    b"\x1d!", b"\x1dB", b"\x1db", b"\x1d|",
+}
+
+
+class EmulatedPrinter(Escpos):
+    """
+    ESC/POS printer backend that decodes jobs back into page images instead of printing them.
+
+    It accepts the exact byte stream a USB printer would receive, so it can be used anywhere a
+    `Usb` printer is. Raster images (GS v 0), paper feeds (LF, ESC d, ESC J) and cuts (GS V) are
+    decoded into one image per cut page. Text and mode commands (MODE_COMMANDS) are accepted but
+    not drawn; only the line feeds that end text lines move the paper. Print speed and receive
+    buffer size are modelled, so the time a real printer would need, and how long the host would
+    be blocked on a full buffer, can be measured without hardware.
+
+    Attributes:
+        pages (list[Image.Image]): The decoded pages, one per cut.
+        bytes_received (int): Total number of bytes received.
+        stall_seconds (float): Simulated time the host spent blocked on a full buffer.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path | None = None,
+        width: int = 576,
+        speed: float = 100.0,
+        dots_per_mm: float = 8.0,
+        buffer_size: int = 4096,
+        cut_seconds: float = 0.5,
+        realtime: bool = False,
+        **kwargs,
+    ) -> None:
+        """
+        Initializes the emulated printer.
+
+        Args:
+            output_dir (Path | None): If set, each page is saved there as a PNG when it is cut.
+            width (int): Paper width in dots. Pages are widened to fit wider rasters.
+            speed (float): Print and feed speed in mm per second.
+            dots_per_mm (float): Print resolution.
+            buffer_size (int): Receive buffer size in bytes.
+            cut_seconds (float): Time taken by each cut.
+            realtime (bool): If True, block the caller for as long as a real printer would stall it.
+            **kwargs: Passed on to Escpos, e.g. profile.
+        """
+        Escpos.__init__(self, **kwargs)
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.width = width
+        self.speed = speed
+        self.dots_per_mm = dots_per_mm
+        self.buffer_size = buffer_size
+        self.cut_seconds = cut_seconds
+        self.realtime = realtime
+
+        self.pages: list[Image.Image] = []
+        self.bytes_received = 0
+        self.stall_seconds = 0.0
+
+        self._pending = bytearray()
+        self._segments: list[Image.Image | int] = []
+        self._line_spacing = DEFAULT_LINE_SPACING
+        # Simulated host clock, the moment the print head goes idle, and the
+        # (finish time, size) of each command still held in the buffer
+        self._clock = 0.0
+        self._busy_until = 0.0
+        self._queue: deque[tuple[float, int]] = deque()
+        self._buffered = 0
+
+    @property
+    def elapsed(self) -> float:
+        """
+        Simulated time from the first byte received until the last page is finished.
+
+        Returns:
+            float: The elapsed time in seconds.
+        """
+        return max(self._clock, self._busy_until)
+
+    def _raw(self, msg: bytes) -> None:
+        """
+        Receives raw data as a USB printer would, decoding every complete command.
+
+        Args:
+            msg (bytes): The ESC/POS data.
+
+        Raises:
+            ValueError: If the data contains an unsupported command. Any data not yet decoded is dropped.
+        """
+        self.bytes_received += len(msg)
+        self._pending += msg
+        stalled = self.stall_seconds
+        while self._pending:
+            try:
+                size = self._decode(self._pending)
+            except ValueError:
+                # The length of an unknown command can't be known, so drop everything
+                # buffered rather than get stuck on it
+                self._pending.clear()
+                raise
+            if size is None:
+                # Wait for the rest of the command
+                break
+            del self._pending[:size]
+        if self.realtime and self.stall_seconds > stalled:
+            time.sleep(self.stall_seconds - stalled)
+
+    def _decode(self, data: bytearray) -> int | None:
+        """
+        Decodes the command at the start of the data.
+
+        Args:
+            data (bytearray): The received data not yet decoded.
+
+        Raises:
+            ValueError: If the command is not supported.
+
+        Returns:
+            int | None: The size of the command, or None if it is incomplete.
+        """
+        if data[0] == LF:
+            self._feed(self._line_spacing, size=1)
+            return 1
+        if data[0] not in (ESC, GS):
+            if data[0] < 0x20 and data[0] not in (0x09, 0x0D):
+                raise ValueError(f"Unsupported ESC/POS data: {bytes(data[:8])!r}")
+            # Text up to the next control byte
+            size = 1
+            while size < len(data) and (data[size] >= 0x20 or data[size] in (0x09, 0x0D)):
+                size += 1
+            self._schedule(size, 0)
+            return size
+        if len(data) < 2:
+            return None
+
+        command = bytes(data[:2])
+        if command == b"\x1b@":
+            self._line_spacing = DEFAULT_LINE_SPACING
+            self._schedule(2, 0)
+            return 2
+        if command == b"\x1b2":
+            self._line_spacing = DEFAULT_LINE_SPACING
+            self._schedule(2, 0)
+            return 2
+        if command in MODE_COMMANDS or command in (b"\x1b3", b"\x1bd", b"\x1bJ"):
+            if len(data) < 3:
+                return None
+            n = data[2]
+            if command in MODE_COMMANDS:
+                self._schedule(3, 0)
+            elif command == b"\x1b3":
+                self._line_spacing = n
+                self._schedule(3, 0)
+            elif command == b"\x1bd":
+                self._feed(n * self._line_spacing, size=3)
+            else:
+                self._feed(n, size=3)
+            return 3
+        if command == b"\x1dV":
+            if len(data) < 3:
+                return None
+            if data[2] in (0, 1, 48, 49):
+                self._cut(size=3)
+                return 3
+            if data[2] in (65, 66, 97, 98):
+                if len(data) < 4:
+                    return None
+                self._feed(data[3], size=0)
+                self._cut(size=4)
+                return 4
+        if command == b"\x1dv":
+            return self._raster(data)
+        raise ValueError(f"Unsupported ESC/POS command: {bytes(data[:8])!r}")
+
+    def _raster(self, data: bytearray) -> int | None:
+        """
+        Decodes a GS v 0 raster image.
+
+        Args:
+            data (bytearray): The received data, starting with the command.
+
+        Returns:
+            int | None: The size of the command, or None if it is incomplete.
+        """
+        if len(data) < 8:
+            return None
+        if data[2] != ord("0"):
+            raise ValueError(f"Unsupported ESC/POS command: {bytes(data[:8])!r}")
+        mode = data[3]
+        width_bytes = data[4] + data[5] * 256
+        height = data[6] + data[7] * 256
+        size = 8 + width_bytes * height
+        if len(data) < size:
+            return None
+
+        img = Image.frombytes("1", (width_bytes * 8, height), bytes(data[8:size]), "raw", "1;I")
+        # Modes 1-3 double the width and/or height of each dot
+        scale_x = 2 if mode & 1 else 1
+        scale_y = 2 if mode & 2 else 1
+        if scale_x > 1 or scale_y > 1:
+            img = img.resize((img.width * scale_x, img.height * scale_y), Image.Resampling.NEAREST)
+        self._segments.append(img)
+        self._schedule(size, img.height / (self.speed * self.dots_per_mm))
+        return size
+
+    def _feed(self, dots: int, size: int) -> None:
+        """
+        Feeds the paper by the given number of dots.
+
+        Args:
+            dots (int): The feed distance in dots.
+            size (int): The size of the command in bytes.
+        """
+        self._segments.append(dots)
+        self._schedule(size, dots / (self.speed * self.dots_per_mm))
+
+    def _cut(self, size: int) -> None:
+        """
+        Cuts the paper, turning everything since the previous cut into a page.
+
+        Args:
+            size (int): The size of the command in bytes.
+        """
+        self._finish_page()
+        self._schedule(size, self.cut_seconds)
+
+    def _finish_page(self) -> None:
+        """
+        Composes the decoded rasters and feeds into a page image, saving it if configured.
+        """
+        if not self._segments:
+            return
+        images = [s for s in self._segments if isinstance(s, Image.Image)]
+        width = max([self.width] + [img.width for img in images])
+        height = sum(s.height if isinstance(s, Image.Image) else s for s in self._segments)
+        page = Image.new("1", (width, max(height, 1)), 1)
+        y = 0
+        for segment in self._segments:
+            if isinstance(segment, Image.Image):
+                page.paste(segment, (0, y))
+                y += segment.height
+            else:
+                y += segment
+        self._segments = []
+        self.pages.append(page)
+        if self.output_dir:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            page.save(self.output_dir / f"page-{len(self.pages):04d}.png")
+
+    def _schedule(self, size: int, seconds: float) -> None:
+        """
+        Models the command passing through the receive buffer and the print mechanism.
+
+        The host is blocked while the buffer is too full to accept the command, and the
+        command stays in the buffer until the mechanism has finished executing it.
+
+        Args:
+            size (int): The size of the command in bytes.
+            seconds (float): The time the mechanism needs to execute the command.
+        """
+        while self._queue and (
+            self._queue[0][0] <= self._clock or self._buffered + size > self.buffer_size
+        ):
+            finished_at, finished_size = self._queue.popleft()
+            if finished_at > self._clock:
+                self.stall_seconds += finished_at - self._clock
+                self._clock = finished_at
+            self._buffered -= finished_size
+        self._busy_until = max(self._clock, self._busy_until) + seconds
+        self._queue.append((self._busy_until, size))
+        self._buffered += size
+
+    def summary(self) -> str:
+        """
+        Formats the throughput of everything printed so far.
+
+        Returns:
+            str: A one-line summary.
+        """
+        rate = len(self.pages) / self.elapsed * 60 if self.elapsed else 0.0
+        return (
+            f"Emulated {len(self.pages)} page(s), {self.bytes_received} bytes in {self.elapsed:.2f}s "
+            f"({rate:.1f} pages/min, host stalled {self.stall_seconds:.2f}s)"
+        )
+
+    def close(self) -> None:
+        """
+        Turns any uncut content into a final page.
+        """
+        self._finish_page()
@@ -1,15 +1,24 @@
+import math
+from datetime import timedelta
 from enum import Enum
+from pathlib import Path
 from typing import List
 import typer
 from dominate.tags import div
 
 # Support both direct execution and package imports
 try:
+    from . import budget
+    from . import emulator
     from . import printer_core as p
+    from . import scheduler
     from . import sudoku_module
     from . import weather_module
 except ImportError:
+    import budget
+    import emulator
     import printer_core as p
+    import scheduler
     import sudoku_module
     import weather_module
 
@@ -32,6 +41,50 @@ class PrinterModules(str, Enum):
         elif self == PrinterModules.weather:
             return weather_module.generator.generate()
 
+    @property
+    def budget(self) -> float:
+        """
+        Default time budget for generating the module's content.
+
+        Returns:
+            float: The budget in seconds.
+        """
+        return {
+            PrinterModules.sudoku: 2.0,
+            PrinterModules.weather: weather_module.generator.REQUEST_TIMEOUT,
+        }[self]
+
+def render_receipt(
+    modules: List[PrinterModules], budgets: dict[str, float], slo: float
+) -> budget.BudgetReport:
+    """
+    Generates the content of each module and rasterizes the receipt to the default PNG file.
+
+    Modules that miss their budget are replaced with fallback content, and a latency report is printed.
+    Rasterization gets whatever is left of the SLO, but at least p.MIN_RENDER_TIMEOUT.
+
+    Args:
+        modules (List[PrinterModules]): A list of printer modules to generate content from.
+        budgets (dict[str, float]): Per-module budgets in seconds, overriding each module's default.
+        slo (float): Budget in seconds for rendering the whole receipt.
+
+    Returns:
+        budget.BudgetReport: The latency report, listing any modules that used fallback content.
+
+    Raises:
+        TimeoutError: If rasterization does not finish within the remaining SLO.
+    """
+    divs_to_add, report = budget.generate_within_budget(
+        modules=[(u.value, u.generate) for u in modules],
+        budgets={u.value: budgets.get(u.value, u.budget) for u in modules},
+        slo=slo,
+    )
+    print(report.summary())
+    p.create_html_file(contents=divs_to_add)
+    with p.sync_playwright() as playwright:
+        p.run(playwright, timeout=max(slo - report.elapsed, p.MIN_RENDER_TIMEOUT))
+    return report
+
 def main(
     modules: List[PrinterModules],
     dry_run: bool = typer.Option(
@@ -43,6 +96,21 @@ def main(
     product_id: str = typer.Option(
         None, "--product-id", help="USB Product ID (hex string, e.g. 0x2016)."
     ),
+    schedule: List[str] = typer.Option(
+        None, "--schedule", help="Daily print time (HH:MM). Repeat to print several times a day."
+    ),
+    lead_time: int = typer.Option(
+        300, "--lead-time", min=0, help="Seconds before each scheduled print to pre-render the receipt."
+    ),
+    budgets: List[str] = typer.Option(
+        None, "--budget", help="Module time budget (name=seconds, e.g. weather=3). Repeat for several modules."
+    ),
+    slo: float = typer.Option(
+        10.0, "--slo", help="Seconds allowed for rendering the whole receipt."
+    ),
+    emulate: Path = typer.Option(
+        None, "--emulate", help="Decode print jobs into page images in this directory instead of printing."
+    ),
 ):
     """
     Main function to generate HTML content and print an image based on the provided modules.
@@ -52,28 +120,83 @@ def main(
         dry_run (bool): If True, skip printing.
         vendor_id (str): USB Vendor ID.
         product_id (str): USB Product ID.
+        schedule (List[str]): Daily print times. If given, run as a daemon instead of printing once.
+        lead_time (int): Seconds before each scheduled print to pre-render the receipt.
+        budgets (List[str]): Per-module time budgets, overriding the defaults.
+        slo (float): Seconds allowed for rendering the whole receipt.
+        emulate (Path): If given, send print jobs to an emulated printer that saves pages here.
 
     Raises:
         typer.Abort: If no modules are provided.
+        typer.BadParameter: If a schedule time, budget or SLO is invalid.
+        typer.Exit: If the receipt could not be rendered within the SLO.
     """
     if not modules:
         print("No modules provided")
         raise typer.Abort()
 
-    divs_to_add = [u.generate() for u in modules]
-    p.create_html_file(contents=divs_to_add)
-    with p.sync_playwright() as playwright:
-        p.run(playwright)
-
-    if dry_run:
-        print("Dry run: Skipping print.")
-        return
+    try:
+        module_budgets = budget.parse_budgets(budgets or [])
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--budget") from e
+    if not math.isfinite(slo) or slo <= 0:
+        raise typer.BadParameter("SLO must be a positive number of seconds", param_hint="--slo")
+    unknown = sorted(set(module_budgets) - {m.value for m in PrinterModules})
+    if unknown:
+        raise typer.BadParameter(
+            f"Unknown module(s): {', '.join(unknown)}", param_hint="--budget"
+        )
 
     # Convert hex strings to integers if provided
     vid = int(vendor_id, 16) if vendor_id else None
     pid = int(product_id, 16) if product_id else None
+    printer = emulator.EmulatedPrinter(output_dir=emulate) if emulate else None
+
+    if schedule:
+        try:
+            times = scheduler.parse_times(schedule)
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="--schedule") from e
+
+        def prepare() -> bytes:
+            report = render_receipt(modules, budgets=module_budgets, slo=slo)
+            payload = p.encode_img(img_source=str(p.DEFAULT_PNG_FILE))
+            if report.fallbacks:
+                raise scheduler.DegradedRender(
+                    f"fallback content used for {', '.join(report.fallbacks)}", payload=payload
+                )
+            return payload
+
+        def deliver(payload: bytes) -> None:
+            if dry_run:
+                print(f"Dry run: Skipping print of {len(payload)} bytes.")
+                return
+            p.print_raw(payload, id_vendor=vid, id_product=pid, printer=printer)
+            if printer:
+                print(printer.summary())
+
+        scheduler.run_schedule(
+            times=times,
+            lead_time=timedelta(seconds=lead_time),
+            prepare=prepare,
+            deliver=deliver,
+        )
+        return
+
+    try:
+        render_receipt(modules, budgets=module_budgets, slo=slo)
+    except TimeoutError as e:
+        print(f"Receipt failed: {e}")
+        raise typer.Exit(code=1) from e
+
+    if dry_run:
+        print("Dry run: Skipping print.")
+        return
 
-    p.print_img(img_source="temp.png", id_vendor=vid, id_product=pid)
+    p.print_img(img_source="temp.png", id_vendor=vid, id_product=pid, printer=printer)
+    if printer:
+        printer.close()
+        print(printer.summary())
 
 if __name__ == "__main__":
     typer.run(main)
\ No newline at end of file
@@ -1,8 +1,10 @@
+import time
 from typing import Any
 
-from escpos.printer import Usb
+from escpos.escpos import Escpos
+from escpos.printer import Dummy, Usb
 
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 import dominate
 from dominate.tags import div, link
 from pathlib import Path
@@ -10,21 +12,43 @@ from pathlib import Path
 # Inspired largely by: https://codepen.io/silkine/pen/QWBxVX
 DEFAULT_HTML_FILE = Path("temp.html")
 DEFAULT_PNG_FILE = Path("temp.png")
+# Shortest time given to rasterization, even when the rest of the job used up its budget
+MIN_RENDER_TIMEOUT = 1.0
 
 
-def run(_playwright: sync_playwright) -> None:
+def run(_playwright: sync_playwright, timeout: float | None = None) -> None:
     """
     Launches a Chromium browser instance, navigates to a local HTML file,
     takes a screenshot of the content, and saves it as a PNG file.
 
     Args:
         _playwright (sync_playwright): The Playwright instance used to control the browser.
+        timeout (float | None): Seconds allowed for loading the page and taking the screenshot.
+                                If None, Playwright's default timeouts apply.
+
+    Raises:
+        TimeoutError: If the page could not be loaded and captured within the timeout.
     """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+
+    def remaining_ms() -> float | None:
+        # Playwright treats None as its default timeout and 0 as no timeout at all
+        return max(deadline - time.monotonic(), 0.001) * 1000 if deadline else None
+
     browser = _playwright.chromium.launch()
-    page = browser.new_page()
-    page.goto(DEFAULT_HTML_FILE.absolute().as_uri(), wait_until="networkidle")
-    page.locator(".content").screenshot(path=DEFAULT_PNG_FILE)
-    browser.close()
+    try:
+        page = browser.new_page()
+        page.goto(
+            DEFAULT_HTML_FILE.absolute().as_uri(),
+            wait_until="networkidle",
+            timeout=remaining_ms(),
+        )
+        page.locator(".content").screenshot(path=DEFAULT_PNG_FILE, timeout=remaining_ms())
+    except PlaywrightTimeoutError as e:
+        limit = f" than {timeout:.2f}s" if timeout is not None else " than allowed"
+        raise TimeoutError(f"Rendering the receipt took longer{limit}") from e
+    finally:
+        browser.close()
 
 
 def create_html_file(contents: list[div] | None = None) -> None:
@@ -57,20 +81,16 @@ def create_html_file(contents: list[div] | None = None) -> None:
         f.write(doc.render())
 
 
-def print_img(img_source: Any, id_vendor: Any | None, id_product: Any | None) -> None:
+def get_printer(id_vendor: Any | None, id_product: Any | None) -> Usb:
     """
-    Prints an image to a thermal printer.
+    Creates the USB printer connection, falling back to the default IDs.
 
     Args:
-        img_source (Any): The source of the image to be printed.
         id_vendor (Any | None): The vendor ID of the USB printer. If not provided, the default value of 0x1FC9 will be used.
         id_product (Any | None): The product ID of the USB printer. If not provided, the default value of 0x2016 will be used.
 
-    Raises:
-        ValueError: If there is an error while printing the image.
-
     Returns:
-        None
+        Usb: The printer connection.
     """
     if not id_vendor:
         print("Setting default id_vendor of 0x1fc9...")
@@ -78,10 +98,86 @@ def print_img(img_source: Any, id_vendor: Any | None, id_product: Any | None) ->
     if not id_product:
         print("Setting default id_product of 0x2016...")
         id_product = 0x2016
-    printer = Usb(idVendor=id_vendor, idProduct=id_product)
+    return Usb(idVendor=id_vendor, idProduct=id_product)
+
+
+def print_img(
+    img_source: Any,
+    id_vendor: Any | None,
+    id_product: Any | None,
+    printer: Escpos | None = None,
+) -> None:
+    """
+    Prints an image to a thermal printer.
+
+    Args:
+        img_source (Any): The source of the image to be printed.
+        id_vendor (Any | None): The vendor ID of the USB printer. If not provided, the default value of 0x1FC9 will be used.
+        id_product (Any | None): The product ID of the USB printer. If not provided, the default value of 0x2016 will be used.
+        printer (Escpos | None): The printer to use instead of the USB printer, e.g. an EmulatedPrinter.
+
+    Raises:
+        ValueError: If there is an error while printing the image.
+
+    Returns:
+        None
+    """
+    if printer is None:
+        printer = get_printer(id_vendor=id_vendor, id_product=id_product)
     # Attempt to print the image then cut the paper
     try:
         printer.image(img_source=img_source, center=True)
         printer.cut()
     except Exception as e:
         raise ValueError(f"Error while printing image: {e}") from e
+
+
+def encode_img(img_source: Any) -> bytes:
+    """
+    Encodes an image into the ESC/POS byte stream that print_img would send, without touching a printer.
+
+    Args:
+        img_source (Any): The source of the image to be encoded.
+
+    Raises:
+        ValueError: If there is an error while encoding the image.
+
+    Returns:
+        bytes: The raster and cut commands, ready to be sent with print_raw.
+    """
+    printer = Dummy()
+    try:
+        printer.image(img_source=img_source, center=True)
+        printer.cut()
+    except Exception as e:
+        raise ValueError(f"Error while encoding image: {e}") from e
+    return printer.output
+
+
+def print_raw(
+    data: bytes,
+    id_vendor: Any | None,
+    id_product: Any | None,
+    printer: Escpos | None = None,
+) -> None:
+    """
+    Sends an already encoded ESC/POS byte stream to a thermal printer.
+
+    Args:
+        data (bytes): The encoded job, e.g. as returned by encode_img.
+        id_vendor (Any | None): The vendor ID of the USB printer. If not provided, the default value of 0x1FC9 will be used.
+        id_product (Any | None): The product ID of the USB printer. If not provided, the default value of 0x2016 will be used.
+        printer (Escpos | None): The printer to use instead of the USB printer, e.g. an EmulatedPrinter.
+
+    Raises:
+        ValueError: If there is an error while sending the data.
+
+    Returns:
+        None
+    """
+    if printer is None:
+        printer = get_printer(id_vendor=id_vendor, id_product=id_product)
+    try:
+        printer._raw(data)
+    except Exception as e:
+        raise ValueError(f"Error while printing raw data: {e}") from e
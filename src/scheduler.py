@@ -0,0 +1,143 @@
+import time
+from datetime import datetime, time as dt_time, timedelta
+from typing import Callable
+
+# Longest single sleep, so that clock changes (DST, suspend, NTP steps) are noticed promptly
+MAX_SLEEP = 60.0
+
+
+class DegradedRender(Exception):
+    """
+    Raised by a prepare callback when the receipt rendered, but only with fallback content.
+
+    Attributes:
+        payload (bytes): The encoded degraded receipt, printed if nothing better is available.
+    """
+
+    def __init__(self, message: str, payload: bytes) -> None:
+        super().__init__(message)
+        self.payload = payload
+
+
+def parse_times(values: list[str]) -> list[dt_time]:
+    """
+    Parses a list of "HH:MM" strings into sorted time objects.
+
+    Args:
+        values (list[str]): The print times, e.g. ["07:00", "12:30"].
+
+    Raises:
+        ValueError: If a value is not a valid "HH:MM" time.
+
+    Returns:
+        list[dt_time]: The parsed times, sorted and de-duplicated.
+    """
+    try:
+        return sorted({datetime.strptime(v, "%H:%M").time() for v in values})
+    except ValueError as e:
+        raise ValueError(f"Invalid schedule time (expected HH:MM): {e}") from e
+
+
+def next_run(times: list[dt_time], now: datetime) -> datetime:
+    """
+    Finds the next scheduled print time strictly after the given moment.
+
+    Args:
+        times (list[dt_time]): The daily print times.
+        now (datetime): The current moment.
+
+    Returns:
+        datetime: The next moment at which a receipt should be printed.
+    """
+    candidates = [
+        datetime.combine(now.date() + timedelta(days=offset), t)
+        for offset in (0, 1)
+        for t in times
+    ]
+    return min(c for c in candidates if c > now)
+
+
+def run_schedule(
+    times: list[dt_time],
+    lead_time: timedelta,
+    prepare: Callable[[], bytes],
+    deliver: Callable[[bytes], None],
+    max_runs: int | None = None,
+    clock: Callable[[], datetime] = datetime.now,
+    sleep: Callable[[float], None] = time.sleep,
+) -> None:
+    """
+    Runs the print daemon, pre-rendering each receipt ahead of its print time.
+
+    The receipt is prepared lead_time before each scheduled print, so that at
+    print time only the encoded bytes need to be sent. If the pre-render fails,
+    or is degraded (see DegradedRender), the receipt is rendered on demand at
+    print time instead, keeping the degraded receipt in reserve. Print times missed
+    because the previous receipt ran late are skipped and logged.
+
+    Args:
+        times (list[dt_time]): The daily print times.
+        lead_time (timedelta): How long before each print time to start rendering.
+        prepare (Callable[[], bytes]): Renders the receipt and returns the encoded job. May raise
+                                       DegradedRender if fallback content was used.
+        deliver (Callable[[bytes], None]): Sends an encoded job to the printer.
+        max_runs (int | None): Stop after this many prints. If None, run forever.
+        clock (Callable[[], datetime]): Returns the current moment.
+        sleep (Callable[[float], None]): Sleeps for the given number of seconds.
+
+    Raises:
+        ValueError: If no print times are given.
+
+    Returns:
+        None
+    """
+    if not times:
+        raise ValueError("At least one schedule time is required")
+
+    def wait_until(moment: datetime) -> None:
+        # Sleep in chunks, re-reading the clock, so wall-clock jumps don't shift the print
+        while (remaining := (moment - clock()).total_seconds()) > 0:
+            sleep(min(remaining, MAX_SLEEP))
+
+    runs = 0
+    previous = None
+    while max_runs is None or runs < max_runs:
+        print_at = next_run(times, clock())
+        if previous is not None:
+            skipped = next_run(times, previous)
+            while skipped < print_at:
+                print(f"Skipped print at {skipped:%Y-%m-%d %H:%M}: previous receipt ran past it")
+                skipped = next_run(times, skipped)
+        previous = print_at
+        print(f"Next print at {print_at:%Y-%m-%d %H:%M}")
+        wait_until(print_at - lead_time)
+
+        degraded = None
+        try:
+            payload = prepare()
+        except DegradedRender as e:
+            print(f"Pre-render degraded, will render on demand: {e}")
+            payload, degraded = None, e.payload
+        except Exception as e:
+            print(f"Pre-render failed, will render on demand: {e}")
+            payload = None
+
+        wait_until(print_at)
+        if payload is None:
+            try:
+                payload = prepare()
+            except DegradedRender as e:
+                print(f"On-demand render degraded, printing it anyway: {e}")
+                payload = e.payload
+            except Exception as e:
+                if degraded is not None:
+                    print(f"On-demand render failed, printing degraded pre-render: {e}")
+                    payload = degraded
+                else:
+                    print(f"On-demand render failed, skipping print: {e}")
+        if payload is not None:
+            try:
+                deliver(payload)
+            except Exception as e:
+                print(f"Print failed: {e}")
+        runs += 1
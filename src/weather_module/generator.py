@@ -6,6 +6,9 @@ from pydantic import BaseModel, ValidationError, Field
 from dominate.tags import br, i, p, div, link
 from dominate.util import text
 
+# Seconds to wait on the Open-Meteo API before giving up
+REQUEST_TIMEOUT = 5.0
+
 
 class DailyWeather(BaseModel):
     """
@@ -340,7 +343,7 @@ def wmo_to_fa(wmo_code: int) -> str:
     }.get(wmo_code)
 
 
-def get_weather():
+def get_weather(timeout: float = REQUEST_TIMEOUT):
     """
     Fetch the current weather and daily forecast data from the Open-Meteo API.
 
@@ -349,6 +352,11 @@ def get_weather():
     current weather conditions and daily forecasts such as weather code, maximum and
     minimum temperatures, sunrise and sunset times, and precipitation.
 
+    Parameters
+    ----------
+    timeout : float
+        Seconds to wait for the API to connect and to respond.
+
     Returns
     -------
     WeatherResponse
@@ -358,6 +366,8 @@ def get_weather():
     ------
     ConnectionError
         If the API response status code is not 200 (OK).
+    requests.Timeout
+        If the API does not respond within the timeout.
     ValidationError
         If the JSON response cannot be validated against the WeatherResponse model.
     """
@@ -367,7 +377,7 @@ def get_weather():
         "&current_weather=true&temperature_unit=fahrenheit&windspeed_unit=mph"
         "&precipitation_unit=inch&timeformat=unixtime&timezone=America%2FNew_York"
     )
-    r = requests.get(url)
+    r = requests.get(url, timeout=timeout)
     if r.status_code != 200:
         raise ConnectionError(
             f"Got {r.status_code} response (instead of 200) while fetching weather"
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolate_cwd(tmp_path, monkeypatch):
+    # Rendering writes temp files and module caches relative to the working directory
+    monkeypatch.chdir(tmp_path)
@@ -0,0 +1,111 @@
+import threading
+
+from dominate.tags import div
+
+
+def test_parse_budgets():
+    from src.budget import parse_budgets
+
+    assert parse_budgets(["weather=3", "sudoku=1.5"]) == {"weather": 3.0, "sudoku": 1.5}
+
+
+def test_parse_budgets_invalid():
+    from src.budget import parse_budgets
+
+    for value in ["weather", "weather=soon", "=3", "weather=0", "weather=nan", "weather=inf"]:
+        try:
+            parse_budgets([value])
+        except ValueError as e:
+            assert "name=seconds" in str(e)
+        else:
+            raise AssertionError(f"Expected ValueError for {value!r}")
+
+
+def test_generate_within_budget_uses_placeholder_then_cache(tmp_path):
+    from src.budget import MISS_COUNTS, generate_within_budget
+
+    release = threading.Event()
+
+    def slow() -> div:
+        release.wait(5)
+        return div("late")
+
+    misses = MISS_COUNTS["slow"]
+    try:
+        contents, report = generate_within_budget(
+            modules=[("fast", lambda: div("fresh")), ("slow", slow)],
+            budgets={"slow": 0.05},
+            slo=5,
+            cache_dir=tmp_path,
+        )
+    finally:
+        release.set()
+
+    assert "fresh" in str(contents[0])
+    assert "Slow unavailable" in str(contents[1])
+    assert list(report.fallbacks) == ["slow"]
+    assert "used placeholder" in report.fallbacks["slow"]
+    assert f"misses so far: {misses + 1}" in report.fallbacks["slow"]
+    assert MISS_COUNTS["slow"] == misses + 1
+    assert report.elapsed < 5
+
+    # The last good render of a module is used once it misses its budget
+    def broken() -> div:
+        raise ConnectionError("weather unavailable")
+
+    contents, report = generate_within_budget(
+        modules=[("fast", broken)],
+        budgets={},
+        slo=5,
+        cache_dir=tmp_path,
+    )
+
+    assert "fresh" in str(contents[0])
+    assert "used cached render" in report.fallbacks["fast"]
+    # Failures are counted separately from budget misses
+    assert "failures so far: 1" in report.fallbacks["fast"]
+    assert MISS_COUNTS["fast"] == 0
+
+
+def test_generate_within_budget_enforces_slo(tmp_path):
+    from src.budget import generate_within_budget
+
+    release = threading.Event()
+
+    def slow() -> div:
+        release.wait(5)
+        return div("late")
+
+    try:
+        contents, report = generate_within_budget(
+            modules=[("slow", slow)],
+            budgets={"slow": 5},
+            slo=0.05,
+            cache_dir=tmp_path,
+        )
+    finally:
+        release.set()
+
+    assert "Slow unavailable" in str(contents[0])
+    assert report.elapsed < 5
+    assert "missed 0.05s budget" in report.fallbacks["slow"]
+
+
+def test_timeout_raised_by_module_is_a_failure(tmp_path):
+    from src.budget import FAILURE_COUNTS, MISS_COUNTS, generate_within_budget
+
+    def timing_out() -> div:
+        raise TimeoutError("socket timed out")
+
+    failures = FAILURE_COUNTS["socket"]
+    misses = MISS_COUNTS["socket"]
+    contents, report = generate_within_budget(
+        modules=[("socket", timing_out)],
+        budgets={"socket": 5},
+        slo=5,
+        cache_dir=tmp_path,
+    )
+
+    assert "failed (socket timed out)" in report.fallbacks["socket"]
+    assert FAILURE_COUNTS["socket"] == failures + 1
+    assert MISS_COUNTS["socket"] == misses
@@ -0,0 +1,106 @@
+from PIL import Image, ImageDraw
+
+
+def make_image() -> Image.Image:
+    img = Image.new("1", (64, 40), 1)
+    ImageDraw.Draw(img).rectangle((8, 4, 23, 19), fill=0)
+    return img
+
+
+def test_print_img_decodes_back_to_page(tmp_path):
+    from src.emulator import DEFAULT_LINE_SPACING, EmulatedPrinter
+    from src.printer_core import print_img
+
+    printer = EmulatedPrinter(output_dir=tmp_path, width=64)
+    print_img(img_source=make_image(), id_vendor=None, id_product=None, printer=printer)
+
+    assert len(printer.pages) == 1
+    page = printer.pages[0]
+    # cut() feeds 6 lines before cutting
+    assert page.size == (64, 40 + 6 * DEFAULT_LINE_SPACING)
+    assert page.crop((0, 0, 64, 40)).tobytes() == make_image().tobytes()
+    assert (tmp_path / "page-0001.png").exists()
+
+
+def test_split_stream_matches_whole_stream():
+    from src.emulator import EmulatedPrinter
+    from src.printer_core import encode_img
+
+    data = encode_img(make_image()) * 2
+
+    whole = EmulatedPrinter()
+    whole._raw(data)
+    split = EmulatedPrinter()
+    for i in range(0, len(data), 7):
+        split._raw(data[i:i + 7])
+
+    assert len(whole.pages) == len(split.pages) == 2
+    assert [p.tobytes() for p in whole.pages] == [p.tobytes() for p in split.pages]
+    assert whole.bytes_received == split.bytes_received == len(data)
+
+
+def test_speed_and_buffer_model():
+    from src.emulator import EmulatedPrinter
+
+    # A 100-dot raster at 10 mm/s and 10 dots/mm takes 1s to print
+    raster = b"\x1dv0\x00\x01\x00\x64\x00" + b"\x00" * 100
+
+    roomy = EmulatedPrinter(speed=10, dots_per_mm=10, buffer_size=4096, cut_seconds=0)
+    roomy._raw(raster * 3)
+    assert roomy.elapsed == 3.0
+    assert roomy.stall_seconds == 0.0
+
+    # Only one raster fits, so the host waits for the first two to finish
+    tight = EmulatedPrinter(speed=10, dots_per_mm=10, buffer_size=len(raster), cut_seconds=0)
+    tight._raw(raster * 3)
+    assert tight.elapsed == 3.0
+    assert tight.stall_seconds == 2.0
+
+
+def test_unsupported_command():
+    from src.emulator import EmulatedPrinter
+
+    printer = EmulatedPrinter()
+    try:
+        printer._raw(b"\x1b*\x00\x01\x00\xff")
+    except ValueError as e:
+        assert "Unsupported" in str(e)
+    else:
+        raise AssertionError("Expected ValueError")
+
+    # The bad data is dropped, so later jobs still decode
+    from src.printer_core import encode_img
+
+    printer._raw(encode_img(make_image()))
+    assert len(printer.pages) == 1
+    assert printer.pages[0].crop((0, 0, 64, 40)).tobytes() == make_image().tobytes()
+
+
+def test_text_and_mode_commands_are_accepted():
+    from src.emulator import DEFAULT_LINE_SPACING, EmulatedPrinter
+    from src.printer_core import print_img
+
+    printer = EmulatedPrinter(width=64)
+    printer.set(align="center", bold=True, underline=1, double_height=True, invert=True, smooth=True)
+    printer.textln("héllo")
+    printer.set_with_default()
+    print_img(img_source=make_image(), id_vendor=None, id_product=None, printer=printer)
+
+    assert len(printer.pages) == 1
+    page = printer.pages[0]
+    # Text is not drawn, but its line feed moves the paper
+    assert page.size == (64, DEFAULT_LINE_SPACING + 40 + 6 * DEFAULT_LINE_SPACING)
+    assert page.crop((0, DEFAULT_LINE_SPACING, 64, DEFAULT_LINE_SPACING + 40)).tobytes() == make_image().tobytes()
+
+
+def test_close_flushes_uncut_page():
+    from src.emulator import EmulatedPrinter
+
+    printer = EmulatedPrinter(width=8)
+    printer._raw(b"\x1dv0\x00\x01\x00\x02\x00\xff\x00")
+    assert printer.pages == []
+
+    printer.close()
+    assert len(printer.pages) == 1
+    assert printer.pages[0].size == (8, 2)
+    assert "1 page(s), 10 bytes" in printer.summary()
@@ -46,7 +46,8 @@ def test_main_with_config():
                     mock_print.assert_called_once_with(
                         img_source="temp.png",
                         id_vendor=0x1234,
-                        id_product=0x5678
+                        id_product=0x5678,
+                        printer=None
                     )
 
 def test_no_modules():
@@ -59,3 +60,168 @@ def test_no_modules():
     assert result.exit_code != 0
     # Typer catches this before our code runs
     assert "Missing argument" in result.output
+
+def test_main_schedule():
+    from src.budget import BudgetReport
+    from src.main import main
+
+    app = typer.Typer()
+    app.command()(main)
+
+    with patch("src.scheduler.run_schedule") as mock_schedule:
+        with patch("src.printer_core.print_img") as mock_print:
+            result = runner.invoke(app, [
+                "sudoku", "--schedule", "07:00", "--lead-time", "60",
+                "--vendor-id", "0x1234", "--product-id", "0x5678",
+            ])
+
+            assert result.exit_code == 0
+            mock_print.assert_not_called()
+
+            kwargs = mock_schedule.call_args.kwargs
+            assert [t.strftime("%H:%M") for t in kwargs["times"]] == ["07:00"]
+            assert kwargs["lead_time"].total_seconds() == 60
+
+    with patch("src.main.render_receipt") as mock_render:
+        with patch("src.printer_core.encode_img") as mock_encode:
+            with patch("src.printer_core.print_raw") as mock_print_raw:
+                mock_encode.return_value = b"job"
+                mock_render.return_value = BudgetReport()
+
+                payload = kwargs["prepare"]()
+                assert payload == b"job"
+                mock_render.assert_called_once()
+                mock_encode.assert_called_once_with(img_source="temp.png")
+
+                kwargs["deliver"](payload)
+                mock_print_raw.assert_called_once_with(
+                    b"job", id_vendor=0x1234, id_product=0x5678, printer=None
+                )
+
+def test_main_schedule_degraded_prepare():
+    from src.budget import BudgetReport
+    from src.main import main
+    from src.scheduler import DegradedRender
+
+    app = typer.Typer()
+    app.command()(main)
+
+    with patch("src.scheduler.run_schedule") as mock_schedule:
+        result = runner.invoke(app, ["weather", "--schedule", "07:00"])
+        assert result.exit_code == 0
+
+    with patch("src.main.render_receipt") as mock_render:
+        with patch("src.printer_core.encode_img") as mock_encode:
+            mock_encode.return_value = b"job"
+            mock_render.return_value = BudgetReport(fallbacks={"weather": "missed 5.00s budget"})
+
+            try:
+                mock_schedule.call_args.kwargs["prepare"]()
+            except DegradedRender as e:
+                assert e.payload == b"job"
+                assert "weather" in str(e)
+            else:
+                raise AssertionError("Expected DegradedRender")
+
+def test_main_schedule_dry_run(capsys):
+    from src.main import main
+
+    app = typer.Typer()
+    app.command()(main)
+
+    with patch("src.scheduler.run_schedule") as mock_schedule:
+        result = runner.invoke(app, ["sudoku", "--schedule", "07:00", "--dry-run"])
+        assert result.exit_code == 0
+
+    with patch("src.printer_core.print_raw") as mock_print_raw:
+        mock_schedule.call_args.kwargs["deliver"](b"job")
+        mock_print_raw.assert_not_called()
+        assert "Dry run: Skipping print of 3 bytes." in capsys.readouterr().out
+
+def test_main_schedule_negative_lead_time():
+    from src.main import main
+
+    app = typer.Typer()
+    app.command()(main)
+
+    with patch("src.scheduler.run_schedule") as mock_schedule:
+        result = runner.invoke(app, ["sudoku", "--schedule", "07:00", "--lead-time", "-300"])
+
+        assert result.exit_code != 0
+        mock_schedule.assert_not_called()
+
+def test_main_emulate(tmp_path):
+    from PIL import Image
+    from src.main import main
+
+    app = typer.Typer()
+    app.command()(main)
+
+    Image.new("1", (64, 40), 0).save("temp.png")
+
+    with patch("src.printer_core.create_html_file") as mock_create:
+        with patch("src.printer_core.sync_playwright") as mock_playwright:
+            with patch("src.printer_core.Usb") as mock_usb:
+                with patch("src.sudoku_module.generator.generate") as mock_generate:
+                    mock_generate.return_value = "<div>sudoku</div>"
+
+                    result = runner.invoke(app, ["sudoku", "--emulate", str(tmp_path / "pages")])
+
+                    assert result.exit_code == 0
+                    assert "Emulated 1 page(s)" in result.stdout
+                    assert (tmp_path / "pages" / "page-0001.png").exists()
+                    mock_usb.assert_not_called()
+
+def test_invalid_budget_and_slo():
+    from src.main import main
+
+    app = typer.Typer()
+    app.command()(main)
+
+    with patch("src.main.render_receipt") as mock_render:
+        for args in (["--budget", "wether=3"], ["--budget", "weather=nan"], ["--slo", "0"], ["--slo", "-1"]):
+            result = runner.invoke(app, ["weather", "--dry-run", *args])
+            assert result.exit_code != 0, args
+        mock_render.assert_not_called()
+
+def test_render_timeout_fails_receipt():
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+    from src.main import main
+
+    app = typer.Typer()
+    app.command()(main)
+
+    with patch("src.printer_core.create_html_file") as mock_create:
+        with patch("src.printer_core.sync_playwright") as mock_playwright:
+            with patch("src.printer_core.print_img") as mock_print:
+                with patch("src.sudoku_module.generator.generate") as mock_generate:
+                    mock_generate.return_value = "<div>sudoku</div>"
+                    playwright = mock_playwright.return_value.__enter__.return_value
+                    page = playwright.chromium.launch.return_value.new_page.return_value
+                    page.goto.side_effect = PlaywrightTimeoutError("networkidle")
+
+                    result = runner.invoke(app, ["sudoku", "--slo", "5"])
+
+                    assert result.exit_code == 1
+                    assert "Receipt failed: Rendering the receipt took longer than" in result.stdout
+                    # Rasterization only gets what is left of the SLO
+                    assert 0 < page.goto.call_args.kwargs["timeout"] <= 5000
+                    playwright.chromium.launch.return_value.close.assert_called_once()
+                    mock_print.assert_not_called()
+
+def test_run_timeout_without_limit():
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+    from src.printer_core import run
+
+    playwright = MagicMock()
+    browser = playwright.chromium.launch.return_value
+    browser.new_page.return_value.goto.side_effect = PlaywrightTimeoutError("networkidle")
+
+    try:
+        run(playwright)
+    except TimeoutError as e:
+        assert str(e) == "Rendering the receipt took longer than allowed"
+    else:
+        raise AssertionError("Expected TimeoutError")
+    assert browser.new_page.return_value.goto.call_args.kwargs["timeout"] is None
+    browser.close.assert_called_once()
@@ -0,0 +1,206 @@
+from datetime import datetime, time, timedelta
+
+
+class FakeClock:
+    def __init__(self, start: datetime):
+        self.now = start
+        self.sleeps = []
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += timedelta(seconds=seconds)
+
+
+def test_parse_times_sorts_and_dedupes():
+    from src.scheduler import parse_times
+
+    assert parse_times(["12:30", "07:00", "07:00"]) == [time(7, 0), time(12, 30)]
+
+
+def test_parse_times_invalid():
+    from src.scheduler import parse_times
+
+    try:
+        parse_times(["7am"])
+    except ValueError as e:
+        assert "HH:MM" in str(e)
+    else:
+        raise AssertionError("Expected ValueError")
+
+
+def test_next_run_rolls_over_to_tomorrow():
+    from src.scheduler import next_run
+
+    times = [time(7, 0), time(12, 0)]
+    assert next_run(times, datetime(2024, 1, 1, 6, 0)) == datetime(2024, 1, 1, 7, 0)
+    assert next_run(times, datetime(2024, 1, 1, 7, 0)) == datetime(2024, 1, 1, 12, 0)
+    assert next_run(times, datetime(2024, 1, 1, 13, 0)) == datetime(2024, 1, 2, 7, 0)
+
+
+def test_run_schedule_prerenders_before_print_time():
+    from src.scheduler import run_schedule
+
+    clock = FakeClock(datetime(2024, 1, 1, 6, 0))
+    events = []
+
+    def prepare() -> bytes:
+        events.append(("prepare", clock()))
+        return b"job"
+
+    def deliver(payload: bytes) -> None:
+        events.append(("deliver", clock(), payload))
+
+    run_schedule(
+        times=[time(7, 0)],
+        lead_time=timedelta(minutes=5),
+        prepare=prepare,
+        deliver=deliver,
+        max_runs=2,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+    assert events == [
+        ("prepare", datetime(2024, 1, 1, 6, 55)),
+        ("deliver", datetime(2024, 1, 1, 7, 0), b"job"),
+        ("prepare", datetime(2024, 1, 2, 6, 55)),
+        ("deliver", datetime(2024, 1, 2, 7, 0), b"job"),
+    ]
+    assert max(clock.sleeps) <= 60
+
+
+def test_run_schedule_falls_back_to_on_demand_render():
+    from src.scheduler import run_schedule
+
+    clock = FakeClock(datetime(2024, 1, 1, 6, 0))
+    attempts = []
+    delivered = []
+
+    def prepare() -> bytes:
+        attempts.append(clock())
+        if len(attempts) == 1:
+            raise ConnectionError("weather unavailable")
+        return b"job"
+
+    run_schedule(
+        times=[time(7, 0)],
+        lead_time=timedelta(minutes=5),
+        prepare=prepare,
+        deliver=delivered.append,
+        max_runs=1,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+    assert attempts == [datetime(2024, 1, 1, 6, 55), datetime(2024, 1, 1, 7, 0)]
+    assert delivered == [b"job"]
+
+
+def test_run_schedule_follows_clock_jumps():
+    from src.scheduler import run_schedule
+
+    clock = FakeClock(datetime(2024, 1, 1, 6, 0))
+    sleep = clock.sleep
+
+    def suspend_once(seconds: float) -> None:
+        # The machine is suspended for 30 minutes during the first sleep
+        if not clock.sleeps:
+            clock.now += timedelta(minutes=30)
+        sleep(seconds)
+
+    prepared = []
+    delivered = []
+
+    def prepare() -> bytes:
+        prepared.append(clock())
+        return b"job"
+
+    run_schedule(
+        times=[time(7, 0)],
+        lead_time=timedelta(minutes=5),
+        prepare=prepare,
+        deliver=lambda payload: delivered.append(clock()),
+        max_runs=1,
+        clock=clock,
+        sleep=suspend_once,
+    )
+
+    assert prepared == [datetime(2024, 1, 1, 6, 55)]
+    assert delivered == [datetime(2024, 1, 1, 7, 0)]
+
+
+def test_run_schedule_logs_skipped_prints(capsys):
+    from src.scheduler import run_schedule
+
+    clock = FakeClock(datetime(2024, 1, 1, 6, 0))
+    delivered = []
+
+    def deliver(payload: bytes) -> None:
+        delivered.append(clock())
+        # Printing runs past the 07:01 slot
+        clock.now += timedelta(minutes=2)
+
+    run_schedule(
+        times=[time(7, 0), time(7, 1), time(8, 0)],
+        lead_time=timedelta(0),
+        prepare=lambda: b"job",
+        deliver=deliver,
+        max_runs=2,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+    assert delivered == [datetime(2024, 1, 1, 7, 0), datetime(2024, 1, 1, 8, 0)]
+    assert "Skipped print at 2024-01-01 07:01" in capsys.readouterr().out
+
+
+def test_run_schedule_rerenders_degraded_prerender():
+    from src.scheduler import DegradedRender, run_schedule
+
+    clock = FakeClock(datetime(2024, 1, 1, 6, 0))
+    delivered = []
+    results = [DegradedRender("weather missed", payload=b"cached"), b"fresh"]
+
+    def prepare() -> bytes:
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    run_schedule(
+        times=[time(7, 0)],
+        lead_time=timedelta(minutes=5),
+        prepare=prepare,
+        deliver=delivered.append,
+        max_runs=1,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+    assert delivered == [b"fresh"]
+
+
+def test_run_schedule_keeps_degraded_prerender_in_reserve():
+    from src.scheduler import DegradedRender, run_schedule
+
+    clock = FakeClock(datetime(2024, 1, 1, 6, 0))
+    delivered = []
+    results = [DegradedRender("weather missed", payload=b"cached"), ConnectionError("offline")]
+
+    def prepare() -> bytes:
+        raise results.pop(0)
+
+    run_schedule(
+        times=[time(7, 0)],
+        lead_time=timedelta(minutes=5),
+        prepare=prepare,
+        deliver=delivered.append,
+        max_runs=1,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+    assert delivered == [b"cached"]